@@ -9,6 +9,45 @@ from nanobot.bus.events import OutboundMessage
 class MessageTool(Tool):
     """Tool to send messages to users on chat channels."""
 
+    name = "message"
+    description = (
+        "Send a message to the user, optionally with file attachments. "
+        "This is the ONLY way to deliver files (images, documents, audio, video) to the user. "
+        "Use the 'media' parameter with file paths to attach files. "
+        "Do NOT use read_file to send files — that only reads content for your own analysis."
+    )
+    parameters = {
+        "type": "object",
+        "properties": {
+            "content": {
+                "type": "string",
+                "description": "The message content to send. Must be empty string when sending only a sticker or reaction."
+            },
+            "channel": {
+                "type": "string",
+                "description": "Optional: target channel (telegram, discord, etc.)"
+            },
+            "chat_id": {
+                "type": "string",
+                "description": "Optional: target chat/user ID"
+            },
+            "message_id": {
+                "type": "string",
+                "description": "Optional: message ID to react to (required when sending a reaction)"
+            },
+            "reaction": {
+                "type": "string",
+                "description": "Optional: emoji reaction to add to a message (requires message_id). E.g. '👍', '❤️', '🔥'"
+            },
+            "media": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Optional: list of file paths to attach (images, audio, documents). To send a Telegram sticker, use 'sticker:<file_id>' format, e.g. 'sticker:CAACAgU...'. Do NOT mix stickers with text content."
+            }
+        },
+        "required": ["content"]
+    }
+
     def __init__(
         self,
         send_callback: Callable[[OutboundMessage], Awaitable[None]] | None = None,
@@ -36,53 +75,6 @@ class MessageTool(Tool):
         """Reset per-turn send tracking."""
         self._sent_in_turn = False
 
-    @property
-    def name(self) -> str:
-        return "message"
-
-    @property
-    def description(self) -> str:
-        return (
-            "Send a message to the user, optionally with file attachments. "
-            "This is the ONLY way to deliver files (images, documents, audio, video) to the user. "
-            "Use the 'media' parameter with file paths to attach files. "
-            "Do NOT use read_file to send files — that only reads content for your own analysis."
-        )
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "content": {
-                    "type": "string",
-                    "description": "The message content to send. Must be empty string when sending only a sticker or reaction."
-                },
-                "channel": {
-                    "type": "string",
-                    "description": "Optional: target channel (telegram, discord, etc.)"
-                },
-                "chat_id": {
-                    "type": "string",
-                    "description": "Optional: target chat/user ID"
-                },
-                "message_id": {
-                    "type": "string",
-                    "description": "Optional: message ID to react to (required when sending a reaction)"
-                },
-                "reaction": {
-                    "type": "string",
-                    "description": "Optional: emoji reaction to add to a message (requires message_id). E.g. '👍', '❤️', '🔥'"
-                },
-                "media": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Optional: list of file paths to attach (images, audio, documents). To send a Telegram sticker, use 'sticker:<file_id>' format, e.g. 'sticker:CAACAgU...'. Do NOT mix stickers with text content."
-                }
-            },
-            "required": ["content"]
-        }
-
     async def execute(
         self,
         content: str,
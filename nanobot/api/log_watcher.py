@@ -1,16 +1,30 @@
 """Log watcher for parsing nanobot logs and tracking status."""
 
 import asyncio
+import hashlib
+import mmap
 import os
 import re
+import secrets
+import sys
+from bisect import bisect_right
 from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Literal
+from typing import BinaryIO, Literal
 
 from loguru import logger
 
+try:
+    from watchfiles import awatch
+
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+    awatch = None
+
 
 StatusType = Literal["thinking", "tool_call", "listening", "idle"]
 
@@ -31,7 +45,8 @@ class StatusState:
     status: StatusType = "idle"
     detail: str = "💤 空闲"
     logs: deque = field(default_factory=lambda: deque(maxlen=100))
-    last_activity: datetime = field(default_factory=datetime.now)
+    log_ts: deque = field(default_factory=lambda: deque(maxlen=100))  # Mirrors logs[i]["ts"]
+    version: int = 0  # Bumped on every change, used for HTTP ETags
 
 
 class LogWatcher:
@@ -41,14 +56,23 @@ class LogWatcher:
     Maintains a ring buffer of recent log entries and current status.
     """
     
-    # Log parsing patterns
-    TOOL_RE = re.compile(r"Tool call: (\w+)\((.+?)\)")
-    LLM_REQ_RE = re.compile(r"LLM Request: model=(.+?),")
-    LLM_RESP_RE = re.compile(r"LLM Response: mode=(\w+)")
-    MSG_RE = re.compile(r"Processing message from (\S+)")
+    # Loguru line: 2026-02-18 23:50:00.123 | INFO | ... followed by one of
+    # the events we track. A single alternation keeps it to one scan per line.
+    LINE_PATTERN = (
+        r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)"
+        r".*?(?:"
+        r"(?P<tool>Tool call: (?P<tool_name>\w+)\((?P<tool_args>.+?)\))"
+        r"|(?P<llm_request>LLM Request: model=[^,\n]+,)"
+        r"|(?P<llm_response>LLM Response: mode=\w+)"
+        r"|(?P<listening>Processing message from (?P<sender>\S+))"
+        r")"
+    )
+    LINE_RE = re.compile(LINE_PATTERN)
+    # Same pattern over raw bytes, for scanning large backlogs in place
+    LINE_BYTES_RE = re.compile(LINE_PATTERN.encode(), re.MULTILINE)
     
-    # Timestamp pattern in loguru logs: 2026-02-18 23:50:00.123 | INFO | ...
-    TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)")
+    # Unread backlogs at least this large are scanned via mmap instead of readlines()
+    MMAP_THRESHOLD = 64 * 1024
     
     # Tool name to emoji/detail mapping
     TOOL_DETAILS = {
@@ -63,7 +87,12 @@ class LogWatcher:
         "spawn": ("🚀", "启动子任务"),
     }
     
-    IDLE_TIMEOUT = timedelta(seconds=30)
+    IDLE_TIMEOUT = 30.0  # seconds
+    
+    # watchfiles batching: under continuous writes a batch is yielded at least
+    # every WATCH_DEBOUNCE_MS (its default of 1600ms would lag the old 500ms poll)
+    WATCH_DEBOUNCE_MS = 200
+    WATCH_STEP_MS = 50
     
     def __init__(self, log_dir: Path | None = None):
         self.log_dir = log_dir or Path.home() / ".nanobot" / "logs"
@@ -71,7 +100,12 @@ class LogWatcher:
         self._running = False
         self._current_file: Path | None = None
         self._file_pos = 0
+        self._fh: BinaryIO | None = None
+        self._idle_handle: asyncio.TimerHandle | None = None
         self._watch_task: asyncio.Task | None = None
+        # Versions restart at 0 in every process; the nonce keeps ETags from
+        # before a restart from matching a later state with the same version
+        self._etag_nonce = secrets.token_hex(4)
     
     def _get_log_file(self, date: datetime | None = None) -> Path:
         """Get log file path for a given date."""
@@ -80,44 +114,53 @@ class LogWatcher:
     
     def _parse_line(self, line: str) -> LogEntry | None:
         """Parse a single log line into a LogEntry."""
-        # Extract timestamp
-        ts_match = self.TS_RE.match(line)
-        if not ts_match:
+        # Cheap reject for tracebacks and continuation lines before touching the regex
+        if len(line) < 23 or line[4] != "-" or line[7] != "-":
             return None
-        ts = ts_match.group(1)
+        m = self.LINE_RE.match(line)
+        return self._entry_from_match(m) if m else None
+    
+    @staticmethod
+    def _group(m: re.Match, name: str) -> str | None:
+        """Get a match group as text, decoding matches made over bytes."""
+        value = m.group(name)
+        return value.decode("utf-8", errors="ignore") if isinstance(value, bytes) else value
+    
+    def _entry_from_match(self, m: re.Match) -> LogEntry:
+        """Build a LogEntry from a LINE_RE or LINE_BYTES_RE match."""
+        ts = self._group(m, "ts")
+        kind = m.lastgroup
         
-        # Check for tool call
-        tool_match = self.TOOL_RE.search(line)
-        if tool_match:
-            tool_name = tool_match.group(1)
-            tool_args = tool_match.group(2)
+        if kind == "tool":
+            tool_args = self._group(m, "tool_args")
             return LogEntry(
                 ts=ts,
                 type="tool",
-                name=tool_name,
+                # Interned so TOOL_DETAILS lookups hit the identity fast path
+                name=sys.intern(self._group(m, "tool_name")),
                 preview=tool_args[:100] if tool_args else None
             )
+        if kind == "listening":
+            return LogEntry(ts=ts, type="listening", preview=self._group(m, "sender"))
+        return LogEntry(ts=ts, type=kind)
+    
+    def _update_status(self, entries: list[LogEntry]) -> None:
+        """Update current status from a batch of new log entries.
         
-        # Check for LLM request
-        if self.LLM_REQ_RE.search(line):
-            return LogEntry(ts=ts, type="llm_request")
-        
-        # Check for LLM response
-        if self.LLM_RESP_RE.search(line):
-            return LogEntry(ts=ts, type="llm_response")
+        Status is a snapshot, so only the latest entry that changes it matters.
+        """
+        self.state.cursor = entries[-1].ts
+        self.state.version += 1
         
-        # Check for incoming message
-        msg_match = self.MSG_RE.search(line)
-        if msg_match:
-            sender = msg_match.group(1)
-            return LogEntry(ts=ts, type="listening", preview=sender)
+        # Restart the idle countdown on every batch of activity
+        if self._idle_handle:
+            self._idle_handle.cancel()
+        self._idle_handle = asyncio.get_running_loop().call_later(self.IDLE_TIMEOUT, self._set_idle)
         
-        return None
-    
-    def _update_status(self, entry: LogEntry) -> None:
-        """Update current status based on a log entry."""
-        self.state.last_activity = datetime.now()
-        self.state.cursor = entry.ts
+        # LLM responses don't change the displayed status
+        entry = next((e for e in reversed(entries) if e.type != "llm_response"), None)
+        if entry is None:
+            return
         
         if entry.type == "llm_request":
             self.state.status = "thinking"
@@ -135,55 +178,117 @@ class LogWatcher:
         elif entry.type == "listening":
             self.state.status = "listening"
             self.state.detail = f"👂 收到消息 ({entry.preview})"
-        elif entry.type == "llm_response":
-            # After response, briefly show thinking then idle
-            pass
     
-    def _check_idle(self) -> None:
-        """Check if we should transition to idle state."""
-        if datetime.now() - self.state.last_activity > self.IDLE_TIMEOUT:
+    def _set_idle(self) -> None:
+        """Transition to idle state after IDLE_TIMEOUT without activity."""
+        self._idle_handle = None
+        if self.state.status != "idle":
             self.state.status = "idle"
             self.state.detail = "💤 空闲"
+            self.state.version += 1
     
-    async def _read_new_lines(self) -> list[str]:
-        """Read new lines from the current log file."""
+    def _close_file(self) -> None:
+        """Close the persistent log file handle, if open."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+    
+    async def _read_new_entries(self) -> list[LogEntry]:
+        """Read and parse new entries from the current log file.
+        
+        The handle stays open between calls so steady-state reads are a
+        single buffered read rather than open/seek/close each time. Only
+        complete lines are consumed, whichever path reads them.
+        """
         log_file = self._get_log_file()
         
         # Handle day change
         if self._current_file != log_file:
+            self._close_file()
             self._current_file = log_file
             self._file_pos = 0
         
-        if not log_file.exists():
-            return []
-        
         try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(self._file_pos)
-                lines = f.readlines()
-                self._file_pos = f.tell()
-                return lines
+            if self._fh is None:
+                if not log_file.exists():
+                    return []
+                self._fh = open(log_file, "rb")
+                self._fh.seek(self._file_pos)
+            if os.fstat(self._fh.fileno()).st_size - self._file_pos >= self.MMAP_THRESHOLD:
+                return self._scan_mapped()
+            lines = self._fh.readlines()
+            if lines and not lines[-1].endswith(b"\n"):
+                # Leave a partially written last line for the next read
+                self._fh.seek(-len(lines.pop()), os.SEEK_CUR)
+            entries = [
+                entry for line in lines
+                if (entry := self._parse_line(line.decode("utf-8", errors="ignore").strip()))
+            ]
+            self._file_pos = self._fh.tell()
+            return entries
         except Exception as e:
             logger.warning(f"Error reading log file: {e}")
+            self._close_file()
             return []
     
+    def _scan_mapped(self) -> list[LogEntry]:
+        """Scan a large unread backlog in place, without decoding every line."""
+        with mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Only consume complete lines; a trailing partial line is read next time
+            end = mm.rfind(b"\n", self._file_pos) + 1
+            if end <= self._file_pos:
+                return []
+            entries = [
+                self._entry_from_match(m)
+                for m in self.LINE_BYTES_RE.finditer(mm, self._file_pos, end)
+            ]
+        self._file_pos = end
+        self._fh.seek(end)
+        return entries
+    
+    def _record_entries(self, entries: list[LogEntry]) -> None:
+        """Append parsed entries to the ring buffer and refresh status."""
+        if not entries:
+            return
+        self.state.logs.extend(
+            {"ts": e.ts, "type": e.type, "name": e.name, "preview": e.preview}
+            for e in entries
+        )
+        self.state.log_ts.extend(e.ts for e in entries)
+        self._update_status(entries)
+    
+    @staticmethod
+    def _is_log_change(change: object, path: str) -> bool:
+        """watchfiles filter: only react to .log files."""
+        return path.endswith(".log")
+    
     async def _watch_loop(self) -> None:
-        """Main watch loop."""
+        """Main watch loop.
+        
+        Uses OS file notifications (inotify/kqueue via watchfiles) when available,
+        so reads only happen on actual appends. Falls back to polling otherwise.
+        """
+        if WATCHFILES_AVAILABLE:
+            try:
+                async for _ in awatch(
+                    self.log_dir,
+                    watch_filter=self._is_log_change,
+                    debounce=self.WATCH_DEBOUNCE_MS,
+                    step=self.WATCH_STEP_MS,
+                ):
+                    self._record_entries(await self._read_new_entries())
+                return
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logger.warning(f"Log file watching failed, falling back to polling: {e}")
+        await self._poll_loop()
+    
+    async def _poll_loop(self) -> None:
+        """Polling fallback when file notifications are unavailable."""
         while self._running:
             try:
-                lines = await self._read_new_lines()
-                for line in lines:
-                    entry = self._parse_line(line.strip())
-                    if entry:
-                        self.state.logs.append({
-                            "ts": entry.ts,
-                            "type": entry.type,
-                            "name": entry.name,
-                            "preview": entry.preview
-                        })
-                        self._update_status(entry)
-                
-                self._check_idle()
+                self._record_entries(await self._read_new_entries())
                 await asyncio.sleep(0.5)  # Poll every 500ms
             except asyncio.CancelledError:
                 break
@@ -217,8 +322,22 @@ class LogWatcher:
                 await self._watch_task
             except asyncio.CancelledError:
                 pass
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self._close_file()
         logger.info("Log watcher stopped")
     
+    def get_etag(self, cursor: str | None = None) -> str:
+        """
+        Get an ETag for get_status(cursor) without building the payload.
+        
+        The tag changes whenever the status or logs change, differs per cursor,
+        and never repeats across watcher instances (e.g. server restarts).
+        """
+        digest = hashlib.blake2b((cursor or "").encode(), digest_size=8).hexdigest()
+        return f'"{self._etag_nonce}-{self.state.version}-{digest}"'
+    
     def get_status(self, cursor: str | None = None) -> dict:
         """
         Get current status and logs.
@@ -229,11 +348,9 @@ class LogWatcher:
         Returns:
             Status dict with cursor, status, detail, and logs.
         """
-        self._check_idle()
-        
-        logs = list(self.state.logs)
-        if cursor:
-            logs = [log for log in logs if log["ts"] > cursor]
+        # Entries are appended in timestamp order, so binary-search the cut point
+        start = bisect_right(self.state.log_ts, cursor) if cursor else 0
+        logs = list(islice(self.state.logs, start, None))
         
         return {
             "cursor": self.state.cursor,
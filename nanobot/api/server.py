@@ -8,13 +8,25 @@ from loguru import logger
 
 from nanobot.api.log_watcher import LogWatcher
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_response(data: dict) -> web.Response:
+    """Build a JSON response, serializing with orjson when it is installed."""
+    if orjson is None:
+        return web.json_response(data)
+    return web.Response(body=orjson.dumps(data), content_type="application/json")
+
 
 class StatusServer:
     """
     HTTP server providing status API for external devices.
     
     Endpoints:
-        GET /api/status?cursor=xxx - Get current status and logs
+        GET /api/status?cursor=xxx - Get current status and logs (supports If-None-Match)
     """
     
     def __init__(self, host: str = "0.0.0.0", port: int = 8080, log_dir: Path | None = None):
@@ -33,12 +45,16 @@ class StatusServer:
     async def _handle_status(self, request: web.Request) -> web.Response:
         """Handle GET /api/status request."""
         cursor = request.query.get("cursor")
-        status = self.watcher.get_status(cursor)
-        return web.json_response(status)
+        etag = self.watcher.get_etag(cursor)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        response = _json_response(self.watcher.get_status(cursor))
+        response.headers["ETag"] = etag
+        return response
     
     async def _handle_health(self, request: web.Request) -> web.Response:
         """Handle GET /health request."""
-        return web.json_response({"status": "ok"})
+        return _json_response({"status": "ok"})
     
     async def start(self) -> None:
         """Start the HTTP server and log watcher."""
@@ -1,12 +1,56 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
-from typing import Callable, Awaitable
+from collections import deque
+from datetime import datetime
+from typing import Callable, Generic, TypeVar
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 
+T = TypeVar("T")
+
+
+class FastAsyncQueue(Generic[T]):
+    """
+    Unbounded FIFO for the single-consumer paths of the bus.
+
+    A deque plus one Event: put never blocks or takes a lock, and get only
+    waits when the buffer is empty. Exposes the subset of the asyncio.Queue
+    API the bus and its callers use.
+    """
+
+    __slots__ = ("_buf", "_event")
+
+    def __init__(self):
+        self._buf: deque[T] = deque()
+        self._event = asyncio.Event()
+
+    def put_nowait(self, item: T) -> None:
+        self._buf.append(item)
+        self._event.set()
+
+    async def put(self, item: T) -> None:
+        self.put_nowait(item)
+
+    def get_nowait(self) -> T:
+        if not self._buf:
+            raise asyncio.QueueEmpty
+        return self._buf.popleft()
+
+    async def get(self) -> T:
+        while not self._buf:
+            self._event.clear()
+            await self._event.wait()
+        return self._buf.popleft()
+
+    def qsize(self) -> int:
+        return len(self._buf)
+
+    def empty(self) -> bool:
+        return not self._buf
+
 
 class MessageBus:
     """
@@ -17,15 +61,31 @@ class MessageBus:
     """
 
     def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
-        self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
+        # Inbound messages are grouped per session; the ready queue holds each
+        # session key with pending messages exactly once, in arrival order.
+        self._inbound_pending: dict[str, list[InboundMessage]] = {}
+        self._inbound_ready: FastAsyncQueue[str] = FastAsyncQueue()
+        self.outbound: FastAsyncQueue[OutboundMessage] = FastAsyncQueue()
         self._running = False
 
+        # Sessions with a turn in progress. Only touched between awaits, so
+        # no lock is needed and different sessions never contend.
+        self._active_sessions: set[str] = set()
         # Buffer for collecting messages while a session is being processed
-        self._active_inbound_session: str | None = None
         self._inbound_collect_buffer: dict[str, list[InboundMessage]] = {}
-        self._inbound_collect_lock = asyncio.Lock()
+        # Priority messages (e.g. /stop) bypass the collect buffer, see set_priority_filter()
+        self._is_priority: Callable[[str], bool] | None = None
+
+    def set_priority_filter(self, is_priority: Callable[[str], bool] | None) -> None:
+        """Set the predicate for message contents that must never be buffered.
+
+        Priority messages reach the consumer while their session's turn is still
+        running, and do not mark the session active themselves.
+        """
+        self._is_priority = is_priority
+
+    def _is_priority_message(self, msg: InboundMessage) -> bool:
+        return self._is_priority is not None and self._is_priority(msg.content)
 
     async def publish_inbound(self, msg: InboundMessage) -> None:
         """Publish a message from a channel to the agent.
@@ -33,13 +93,21 @@ class MessageBus:
         If the same session is currently being processed, buffer the message
         instead of triggering a new turn.
         """
-        async with self._inbound_collect_lock:
-            if self._active_inbound_session and msg.session_key == self._active_inbound_session:
-                # Same session is active, buffer this message
-                self._inbound_collect_buffer.setdefault(msg.session_key, []).append(msg)
-                logger.debug(f"Buffered message for active session {msg.session_key}")
-                return
-        await self.inbound.put(msg)
+        if msg.session_key in self._active_sessions and not self._is_priority_message(msg):
+            # Same session is active, buffer this message
+            self._inbound_collect_buffer.setdefault(msg.session_key, []).append(msg)
+            logger.debug(f"Buffered message for active session {msg.session_key}")
+            return
+        self._enqueue_inbound(msg)
+
+    def _enqueue_inbound(self, msg: InboundMessage) -> None:
+        """Append a message to its session's pending list, marking the session ready."""
+        pending = self._inbound_pending.get(msg.session_key)
+        if pending is None:
+            self._inbound_pending[msg.session_key] = [msg]
+            self._inbound_ready.put_nowait(msg.session_key)
+        else:
+            pending.append(msg)
 
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available).
@@ -47,40 +115,44 @@ class MessageBus:
         Also drains any same-session messages already sitting in the queue
         (accumulated between turns) and merges them into one.
         """
-        msg = await self.inbound.get()
+        return self._take_session(await self._inbound_ready.get())
 
-        # Drain queue: collect same-session messages, put back others
-        same_session = [msg]
-        others: list[InboundMessage] = []
-        while True:
+    async def consume_inbound_batch(self, max_batch: int = 16) -> list[InboundMessage]:
+        """Consume pending messages for up to max_batch sessions in one wakeup.
+
+        Blocks until at least one session is ready, then takes whatever else is
+        already queued. Returns one (merged) message per session.
+        """
+        keys = [await self._inbound_ready.get()]
+        while len(keys) < max_batch:
             try:
-                queued = self.inbound.get_nowait()
-                if queued.session_key == msg.session_key:
-                    same_session.append(queued)
-                else:
-                    others.append(queued)
+                keys.append(self._inbound_ready.get_nowait())
             except asyncio.QueueEmpty:
                 break
-        for m in others:
-            await self.inbound.put(m)
+        return [self._take_session(key) for key in keys]
 
+    def _take_session(self, key: str) -> InboundMessage:
+        """Pop a ready session's pending messages, merge them and mark it active."""
+        same_session = self._inbound_pending.pop(key)
         if len(same_session) > 1:
-            logger.info("Merging {} queued messages for session {}", len(same_session), msg.session_key)
-            msg = self._merge_buffered_messages(same_session)
-
-        async with self._inbound_collect_lock:
-            self._active_inbound_session = msg.session_key
+            logger.info("Merging {} queued messages for session {}", len(same_session), key)
+        msg = self._merge_buffered_messages(same_session)
+        # A priority command is not a turn; it must not hold the session
+        if not self._is_priority_message(msg):
+            self._active_sessions.add(key)
         return msg
 
     async def complete_inbound_turn(self, msg: InboundMessage) -> None:
         """Called when a turn is complete. Flushes buffered messages if any."""
-        async with self._inbound_collect_lock:
-            buffered = self._inbound_collect_buffer.pop(msg.session_key, [])
-            if buffered:
-                merged = self._merge_buffered_messages(buffered)
-                await self.inbound.put(merged)
-                logger.info(f"Merged {len(buffered)} buffered messages for {msg.session_key}")
-            self._active_inbound_session = None
+        key = msg.session_key
+        self._active_sessions.discard(key)
+        # Common case: nothing arrived during the turn
+        buffered = self._inbound_collect_buffer.pop(key, None)
+        if buffered is None:
+            return
+        merged = self._merge_buffered_messages(buffered)
+        self._enqueue_inbound(merged)
+        logger.info(f"Merged {len(buffered)} buffered messages for {key}")
 
     @classmethod
     def _merge_buffered_messages(cls, messages: list[InboundMessage]) -> InboundMessage:
@@ -88,22 +160,22 @@ class MessageBus:
         if len(messages) == 1:
             return messages[0]
 
-        # Multiple messages: add [sender_id] prefix, join with \n\n
-        parts = [f"[{m.sender_id}] {m.content}" for m in messages]
-        merged_content = "\n\n".join(parts)
-        merged_media = [item for m in messages for item in m.media]
-
-        # Store original messages in metadata for context building
-        collected = [
-            {
+        # Multiple messages: add [sender_id] prefix, join with \n\n.
+        # Original messages are kept in metadata for context building.
+        parts: list[str] = []
+        merged_media: list[str] = []
+        collected: list[dict] = []
+        for m in messages:
+            parts.append(f"[{m.sender_id}] {m.content}")
+            merged_media.extend(m.media)
+            collected.append({
                 "sender_id": m.sender_id,
                 "content": m.content,
                 "media": m.media,
-                "timestamp": m.timestamp.isoformat() if hasattr(m.timestamp, 'isoformat') else str(m.timestamp),
+                "timestamp": m.timestamp.isoformat() if isinstance(m.timestamp, datetime) else str(m.timestamp),
                 "metadata": m.metadata,
-            }
-            for m in messages
-        ]
+            })
+        merged_content = "\n\n".join(parts)
         merged_metadata = {**messages[-1].metadata, "collected_messages": collected}
 
         return InboundMessage(
@@ -114,6 +186,7 @@ class MessageBus:
             media=merged_media,
             metadata=merged_metadata,
             timestamp=messages[-1].timestamp,
+            session_key_override=messages[-1].session_key_override,
         )
 
     async def publish_outbound(self, msg: OutboundMessage) -> None:
@@ -127,7 +200,7 @@ class MessageBus:
     @property
     def inbound_size(self) -> int:
         """Number of pending inbound messages."""
-        return self.inbound.qsize()
+        return sum(len(pending) for pending in self._inbound_pending.values())
 
     @property
     def outbound_size(self) -> int:
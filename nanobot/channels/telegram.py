@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -21,6 +22,49 @@ if TYPE_CHECKING:
     from nanobot.session.manager import SessionManager
 
 
+_CODE_BLOCK_RE = re.compile(r'```[\w]*\n?([\s\S]*?)```')
+_INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+_HEADER_RE = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+_BLOCKQUOTE_RE = re.compile(r'^>\s*(.*)$', re.MULTILINE)
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_BOLD_STAR_RE = re.compile(r'\*\*(.+?)\*\*')
+_BOLD_UNDER_RE = re.compile(r'__(.+?)__')
+_ITALIC_RE = re.compile(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])')
+_STRIKE_RE = re.compile(r'~~(.+?)~~')
+_BULLET_RE = re.compile(r'^[-*]\s+', re.MULTILINE)
+_INLINE_PLACEHOLDER_RE = re.compile(r'\x00IC(\d+)\x00')
+_BLOCK_PLACEHOLDER_RE = re.compile(r'\x00CB(\d+)\x00')
+# Any character that can start a markdown construct handled below
+_MD_MARKER_RE = re.compile(r'[`*_\[#>~-]')
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _restore_placeholders(text: str, pattern: re.Pattern, saved: list[str], open_tag: str, close_tag: str) -> str:
+    """
+    Replace code placeholders with their escaped, tag-wrapped content.
+    
+    Matches the old replace-per-index order without recursion: a saved span
+    only has placeholders with higher indices restored inside it, and
+    placeholder-like text that was already in the input is left alone.
+    """
+    if not saved:
+        return text
+    # Build expansions from the last index down, so every reference is ready
+    expanded = [""] * len(saved)
+    for i in range(len(saved) - 1, -1, -1):
+        def inner(m: re.Match, i: int = i) -> str:
+            idx = int(m.group(1))
+            return expanded[idx] if i < idx < len(saved) else m.group(0)
+        expanded[i] = f"{open_tag}{pattern.sub(inner, saved[i].translate(_HTML_ESCAPE))}{close_tag}"
+
+    def outer(m: re.Match) -> str:
+        idx = int(m.group(1))
+        return expanded[idx] if idx < len(saved) else m.group(0)
+
+    return pattern.sub(outer, text)
+
+
 def _markdown_to_telegram_html(text: str) -> str:
     """
     Convert markdown to Telegram-safe HTML.
@@ -28,13 +72,17 @@ def _markdown_to_telegram_html(text: str) -> str:
     if not text:
         return ""
     
+    # Plain text (the common chat reply) only needs HTML escaping
+    if _MD_MARKER_RE.search(text) is None:
+        return text.translate(_HTML_ESCAPE)
+    
     # 1. Extract and protect code blocks (preserve content from other processing)
     code_blocks: list[str] = []
     def save_code_block(m: re.Match) -> str:
         code_blocks.append(m.group(1))
         return f"\x00CB{len(code_blocks) - 1}\x00"
     
-    text = re.sub(r'```[\w]*\n?([\s\S]*?)```', save_code_block, text)
+    text = _CODE_BLOCK_RE.sub(save_code_block, text)
     
     # 2. Extract and protect inline code
     inline_codes: list[str] = []
@@ -42,48 +90,63 @@ def _markdown_to_telegram_html(text: str) -> str:
         inline_codes.append(m.group(1))
         return f"\x00IC{len(inline_codes) - 1}\x00"
     
-    text = re.sub(r'`([^`]+)`', save_inline_code, text)
+    text = _INLINE_CODE_RE.sub(save_inline_code, text)
     
     # 3. Headers # Title -> just the title text
-    text = re.sub(r'^#{1,6}\s+(.+)$', r'\1', text, flags=re.MULTILINE)
+    text = _HEADER_RE.sub(r'\1', text)
     
     # 4. Blockquotes > text -> just the text (before HTML escaping)
-    text = re.sub(r'^>\s*(.*)$', r'\1', text, flags=re.MULTILINE)
+    text = _BLOCKQUOTE_RE.sub(r'\1', text)
     
     # 5. Escape HTML special characters
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = text.translate(_HTML_ESCAPE)
     
     # 6. Links [text](url) - must be before bold/italic to handle nested cases
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
     
     # 7. Bold **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', text)
-    text = re.sub(r'__(.+?)__', r'<b>\1</b>', text)
+    text = _BOLD_STAR_RE.sub(r'<b>\1</b>', text)
+    text = _BOLD_UNDER_RE.sub(r'<b>\1</b>', text)
     
     # 8. Italic _text_ (avoid matching inside words like some_var_name)
-    text = re.sub(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])', r'<i>\1</i>', text)
+    text = _ITALIC_RE.sub(r'<i>\1</i>', text)
     
     # 9. Strikethrough ~~text~~
-    text = re.sub(r'~~(.+?)~~', r'<s>\1</s>', text)
+    text = _STRIKE_RE.sub(r'<s>\1</s>', text)
     
     # 10. Bullet lists - item -> • item
-    text = re.sub(r'^[-*]\s+', '• ', text, flags=re.MULTILINE)
+    text = _BULLET_RE.sub('• ', text)
     
-    # 11. Restore inline code with HTML tags
-    for i, code in enumerate(inline_codes):
-        # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00IC{i}\x00", f"<code>{escaped}</code>")
-    
-    # 12. Restore code blocks with HTML tags
-    for i, code in enumerate(code_blocks):
-        # Escape HTML in code content
-        escaped = code.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        text = text.replace(f"\x00CB{i}\x00", f"<pre><code>{escaped}</code></pre>")
+    # 11. Restore inline code, then code blocks, with HTML tags
+    if not (code_blocks or inline_codes):
+        return text
+    text = _restore_placeholders(text, _INLINE_PLACEHOLDER_RE, inline_codes, "<code>", "</code>")
+    text = _restore_placeholders(text, _BLOCK_PLACEHOLDER_RE, code_blocks, "<pre><code>", "</code></pre>")
     
     return text
 
 
+# Longer texts are converted in a worker thread so the event loop keeps serving other chats
+_HTML_OFFLOAD_LEN = 2048
+
+
+async def _render_telegram_html(text: str) -> str:
+    """Convert markdown to Telegram HTML, off the event loop for long texts."""
+    if len(text) > _HTML_OFFLOAD_LEN:
+        return await asyncio.to_thread(_markdown_to_telegram_html, text)
+    return _markdown_to_telegram_html(text)
+
+
+def _collapse_whitespace(text: str, limit: int = 200) -> str:
+    """Collapse whitespace runs to single spaces and truncate to limit."""
+    return _WHITESPACE_RE.sub(" ", text).strip()[:limit]
+
+
+def _existing_files(paths: list[str]) -> list[str]:
+    """Keep only the paths that point at regular files."""
+    return [p for p in paths if os.path.isfile(p)]
+
+
 def _split_message(content: str, max_len: int = 4000) -> list[str]:
     """Split content into chunks within max_len, preferring line breaks."""
     if len(content) <= max_len:
@@ -122,6 +185,14 @@ class TelegramChannel(BaseChannel):
         BotCommand("help", "Show available commands"),
     ]
     
+    # File extensions for downloaded media, by MIME type and then by media type
+    _MIME_EXT_MAP = {
+        "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif",
+        "audio/ogg": ".ogg", "audio/mpeg": ".mp3", "audio/mp4": ".m4a",
+        "image/webp": ".webp", "video/webm": ".webm",
+    }
+    _TYPE_EXT_MAP = {"image": ".jpg", "sticker": ".webp", "voice": ".ogg", "audio": ".mp3", "file": ""}
+    
     def __init__(
         self,
         config: TelegramConfig,
@@ -135,9 +206,16 @@ class TelegramChannel(BaseChannel):
         self.session_manager = session_manager
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
-        self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._typing_chats: set[str] = set()  # chat_ids currently showing 'typing...'
+        self._typing_new: set[str] = set()  # Added since the last loop pass, sent right away
+        self._typing_sends: dict[str, asyncio.Task] = {}  # chat_id -> in-flight send
+        self._typing_wakeup = asyncio.Event()
+        self._typing_task: asyncio.Task | None = None  # Single loop serving all typing chats
         self._media_group_buffers: dict[str, dict] = {}
         self._media_group_tasks: dict[str, asyncio.Task] = {}
+        self._stop_event = asyncio.Event()
+        self._media_dir = Path.home() / ".nanobot" / "media"
+        self._transcriber = None  # Created on first voice/audio message
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -146,6 +224,8 @@ class TelegramChannel(BaseChannel):
             return
         
         self._running = True
+        self._stop_event.clear()
+        self._media_dir.mkdir(parents=True, exist_ok=True)
 
         # Build the application with larger connection pool to avoid pool-timeout on long runs
         req = HTTPXRequest(connection_pool_size=16, pool_timeout=5.0, connect_timeout=30.0, read_timeout=30.0)
@@ -192,17 +272,22 @@ class TelegramChannel(BaseChannel):
             drop_pending_updates=True  # Ignore old messages on startup
         )
         
-        # Keep running until stopped
-        while self._running:
-            await asyncio.sleep(1)
+        # Keep running until stop() is called
+        await self._stop_event.wait()
     
     async def stop(self) -> None:
         """Stop the Telegram bot."""
         self._running = False
+        self._stop_event.set()
         
         # Cancel all typing indicators
-        for chat_id in list(self._typing_tasks):
-            self._stop_typing(chat_id)
+        self._typing_chats.clear()
+        self._typing_new.clear()
+        if self._typing_task:
+            self._typing_task.cancel()
+            self._typing_task = None
+        for task in list(self._typing_sends.values()):
+            task.cancel()
 
         for task in self._media_group_tasks.values():
             task.cancel()
@@ -287,7 +372,9 @@ class TelegramChannel(BaseChannel):
                     return
 
             # Check for media (images)
-            valid_media = [p for p in (msg.media or []) if not p.startswith("sticker:") and Path(p).is_file()]
+            candidates = [p for p in (msg.media or []) if not p.startswith("sticker:")]
+            # One executor hop stats every file instead of blocking the loop per path
+            valid_media = await asyncio.to_thread(_existing_files, candidates) if candidates else []
 
             if valid_media:
                 await self._send_with_media(chat_id, msg.content, valid_media, reply_to_message_id)
@@ -312,7 +399,7 @@ class TelegramChannel(BaseChannel):
             )
 
         for i, chunk in enumerate(chunks):
-            html_content = _markdown_to_telegram_html(chunk)
+            html_content = await _render_telegram_html(chunk)
             send_kwargs: dict = {
                 "chat_id": chat_id,
                 "text": html_content,
@@ -359,7 +446,7 @@ class TelegramChannel(BaseChannel):
 
     async def _send_with_media(self, chat_id: int, content: str, media_paths: list[str], reply_to_message_id: int | None) -> None:
         """Send message with photo(s)."""
-        html_caption = _markdown_to_telegram_html(content) if content else None
+        html_caption = await _render_telegram_html(content) if content else None
         reply_kwargs: dict = {}
         if reply_to_message_id is not None:
             reply_kwargs["reply_parameters"] = ReplyParameters(
@@ -368,26 +455,28 @@ class TelegramChannel(BaseChannel):
             )
 
         if len(media_paths) == 1:
-            # Single photo
-            with open(media_paths[0], "rb") as f:
-                await self._app.bot.send_photo(
-                    chat_id=chat_id,
-                    photo=f,
-                    caption=html_caption,
-                    parse_mode="HTML" if html_caption else None,
-                    **reply_kwargs,
-                )
+            # Single photo; read off the event loop so no descriptor is held during the upload
+            photo = await asyncio.to_thread(Path(media_paths[0]).read_bytes)
+            await self._app.bot.send_photo(
+                chat_id=chat_id,
+                photo=photo,
+                caption=html_caption,
+                parse_mode="HTML" if html_caption else None,
+                **reply_kwargs,
+            )
         else:
-            # Multiple photos as media group
-            media_group = []
-            for i, path in enumerate(media_paths):
-                media_group.append(
-                    InputMediaPhoto(
-                        media=open(path, "rb"),
-                        caption=html_caption if i == 0 else None,
-                        parse_mode="HTML" if (i == 0 and html_caption) else None,
-                    )
+            # Multiple photos as media group; read off the event loop, all at once
+            blobs = await asyncio.gather(
+                *(asyncio.to_thread(Path(path).read_bytes) for path in media_paths)
+            )
+            media_group = [
+                InputMediaPhoto(
+                    media=blob,
+                    caption=html_caption if i == 0 else None,
+                    parse_mode="HTML" if (i == 0 and html_caption) else None,
                 )
+                for i, blob in enumerate(blobs)
+            ]
             await self._app.bot.send_media_group(
                 chat_id=chat_id,
                 media=media_group,
@@ -552,21 +641,15 @@ class TelegramChannel(BaseChannel):
                 file = await self._app.bot.get_file(media_file.file_id)
                 ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
                 
-                # Save to workspace/media/
-                from pathlib import Path
-                media_dir = Path.home() / ".nanobot" / "media"
-                media_dir.mkdir(parents=True, exist_ok=True)
-                
-                file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
+                # Save to ~/.nanobot/media/ (created in start())
+                file_path = self._media_dir / f"{media_file.file_id[:16]}{ext}"
                 await file.download_to_drive(str(file_path))
                 
                 media_paths.append(str(file_path))
                 
                 # Handle voice transcription
                 if media_type == "voice" or media_type == "audio":
-                    from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
+                    transcription = await self._get_transcriber().transcribe(file_path)
                     if transcription:
                         logger.info(f"Transcribed {media_type}: {transcription[:50]}...")
                         content_parts.append(f"[transcription: {transcription}]")
@@ -648,26 +731,67 @@ class TelegramChannel(BaseChannel):
 
     def _start_typing(self, chat_id: str) -> None:
         """Start sending 'typing...' indicator for a chat."""
-        # Cancel any existing typing task for this chat
-        self._stop_typing(chat_id)
-        self._typing_tasks[chat_id] = asyncio.create_task(self._typing_loop(chat_id))
+        self._typing_chats.add(chat_id)
+        # Only this chat gets an immediate send; the rest stay on the 4s cadence
+        self._typing_new.add(chat_id)
+        self._typing_wakeup.set()
+        if self._typing_task is None or self._typing_task.done():
+            self._typing_task = asyncio.create_task(self._typing_loop())
     
     def _stop_typing(self, chat_id: str) -> None:
         """Stop the typing indicator for a chat."""
-        task = self._typing_tasks.pop(chat_id, None)
-        if task and not task.done():
-            task.cancel()
+        self._typing_chats.discard(chat_id)
+        self._typing_new.discard(chat_id)
     
-    async def _typing_loop(self, chat_id: str) -> None:
-        """Repeatedly send 'typing' action until cancelled."""
+    async def _typing_loop(self) -> None:
+        """Send 'typing' to every chat in _typing_chats every 4s until cancelled.
+        
+        Chats added in between are sent to as soon as they are added. Sends run
+        as their own tasks so one slow request never delays the others.
+        """
+        loop = asyncio.get_running_loop()
+        next_refresh = 0.0
         try:
             while self._app:
-                await self._app.bot.send_chat_action(chat_id=int(chat_id), action="typing")
-                await asyncio.sleep(4)
+                # Cleared before the snapshot so chats added mid-iteration still wake us
+                self._typing_wakeup.clear()
+                if loop.time() >= next_refresh:
+                    due = self._typing_chats
+                    next_refresh = loop.time() + 4
+                else:
+                    due = self._typing_new
+                for chat_id in list(due):
+                    if chat_id not in self._typing_sends:
+                        task = asyncio.create_task(self._send_typing(chat_id))
+                        self._typing_sends[chat_id] = task
+                        task.add_done_callback(lambda _t, c=chat_id: self._typing_sends.pop(c, None))
+                self._typing_new.clear()
+                
+                # Sleep until the next refresh, or indefinitely while no chat is typing
+                timeout = max(next_refresh - loop.time(), 0) if self._typing_chats else None
+                try:
+                    await asyncio.wait_for(self._typing_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            pass
+    
+    async def _send_typing(self, chat_id: str) -> None:
+        """Send one 'typing' action, dropping the chat from the loop if it fails."""
+        try:
+            await self._app.bot.send_chat_action(chat_id=int(chat_id), action="typing")
         except asyncio.CancelledError:
             pass
         except Exception as e:
             logger.debug(f"Typing indicator stopped for {chat_id}: {e}")
+            self._stop_typing(chat_id)
+
+    def _get_transcriber(self):
+        """Get the transcription provider, creating it on first use."""
+        if self._transcriber is None:
+            from nanobot.providers.transcription import GroqTranscriptionProvider
+            self._transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
+        return self._transcriber
 
     async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Log polling / handler errors instead of silently swallowing them."""
@@ -675,17 +799,7 @@ class TelegramChannel(BaseChannel):
 
     def _get_extension(self, media_type: str, mime_type: str | None) -> str:
         """Get file extension based on media type."""
-        if mime_type:
-            ext_map = {
-                "image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif",
-                "audio/ogg": ".ogg", "audio/mpeg": ".mp3", "audio/mp4": ".m4a",
-                "image/webp": ".webp", "video/webm": ".webm",
-            }
-            if mime_type in ext_map:
-                return ext_map[mime_type]
-
-        type_map = {"image": ".jpg", "sticker": ".webp", "voice": ".ogg", "audio": ".mp3", "file": ""}
-        return type_map.get(media_type, "")
+        return self._MIME_EXT_MAP.get(mime_type) or self._TYPE_EXT_MAP.get(media_type, "")
 
     @staticmethod
     def _extract_reply_metadata(message) -> dict[str, object]:
@@ -697,11 +811,11 @@ class TelegramChannel(BaseChannel):
             replied_user = getattr(replied, "from_user", None)
             replied_text = getattr(replied, "text", None) or getattr(replied, "caption", None)
             if isinstance(replied_text, str):
-                replied_text = " ".join(replied_text.split())[:200]
+                replied_text = _collapse_whitespace(replied_text)
             else:
                 replied_text = None
             if not replied_text and quote and isinstance(getattr(quote, "text", None), str):
-                replied_text = " ".join(quote.text.split())[:200]
+                replied_text = _collapse_whitespace(quote.text)
 
             return {
                 "is_reply": True,
@@ -720,7 +834,7 @@ class TelegramChannel(BaseChannel):
             sender_chat = getattr(origin, "sender_chat", None) or getattr(origin, "chat", None)
             replied_text = None
             if quote and isinstance(getattr(quote, "text", None), str):
-                replied_text = " ".join(quote.text.split())[:200]
+                replied_text = _collapse_whitespace(quote.text)
             return {
                 "is_reply": True,
                 "reply_source": "external_reply",
@@ -736,7 +850,7 @@ class TelegramChannel(BaseChannel):
             return {
                 "is_reply": True,
                 "reply_source": "quote_only",
-                "reply_to_text": " ".join(quote.text.split())[:200],
+                "reply_to_text": _collapse_whitespace(quote.text),
             }
 
         return {}
@@ -138,6 +138,80 @@ class TestDispatch:
         await asyncio.gather(t1, t2)
         assert order == ["start-a", "end-a", "start-b", "end-b"]
 
+    @pytest.mark.asyncio
+    async def test_run_delivers_stop_while_turn_is_running(self):
+        from nanobot.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        loop._connect_mcp = AsyncMock()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def mock_process(m, **kwargs):
+            if m.content == "long job":
+                started.set()
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return OutboundMessage(channel=m.channel, chat_id=m.chat_id, content="ok")
+
+        loop._process_message = mock_process
+        runner = asyncio.create_task(loop.run())
+        try:
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u1", chat_id="a", content="long job"))
+            await asyncio.wait_for(started.wait(), timeout=1.0)
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u2", chat_id="b", content="hi"))
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u1", chat_id="a", content="/stop"))
+
+            await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+        finally:
+            loop._running = False
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_stop_while_waiting_on_gate_does_not_wedge_session(self):
+        from nanobot.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        loop._connect_mcp = AsyncMock()
+        loop._concurrency_gate = asyncio.Semaphore(1)
+        started = asyncio.Event()
+        release = asyncio.Event()
+        processed: list[str] = []
+
+        async def mock_process(m, **kwargs):
+            if m.content == "long job":
+                started.set()
+                await release.wait()
+            processed.append(m.content)
+            return OutboundMessage(channel=m.channel, chat_id=m.chat_id, content="ok")
+
+        loop._process_message = mock_process
+        runner = asyncio.create_task(loop.run())
+        try:
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u2", chat_id="b", content="long job"))
+            await asyncio.wait_for(started.wait(), timeout=1.0)
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u1", chat_id="a", content="queued"))
+            await asyncio.sleep(0.05)
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u1", chat_id="a", content="/stop"))
+            await asyncio.sleep(0.05)
+            assert "t:a" not in bus._active_sessions
+
+            release.set()
+            await bus.publish_inbound(InboundMessage(channel="t", sender_id="u1", chat_id="a", content="again"))
+            for _ in range(100):
+                if "again" in processed:
+                    break
+                await asyncio.sleep(0.01)
+            assert processed == ["long job", "again"]
+        finally:
+            loop._running = False
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
 
 class TestSubagentCancellation:
     @pytest.mark.asyncio
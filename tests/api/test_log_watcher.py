@@ -0,0 +1,181 @@
+"""Tests for LogWatcher log parsing and incremental reads."""
+
+import asyncio
+import random
+
+from nanobot.api import log_watcher as log_watcher_module
+from nanobot.api.log_watcher import LogWatcher
+
+TS = "2026-02-18 23:50:{:02d}.{:03d}"
+
+
+def _line(i: int, kind: str) -> str:
+    ts = TS.format(i // 1000 % 60, i % 1000)
+    prefix = f"{ts} | INFO     | nanobot.agent.loop:run:42 - "
+    if kind == "tool":
+        return prefix + f"Tool call: read_file({{\"path\": \"notes/{i}.md\"}})"
+    if kind == "request":
+        return prefix + "LLM Request: model=test-model, messages=3"
+    if kind == "response":
+        return prefix + "LLM Response: mode=text"
+    if kind == "listening":
+        return prefix + f"Processing message from telegram:用户{i}"
+    if kind == "traceback":
+        return "  File \"nanobot/agent/loop.py\", line 42, in run"
+    return prefix + "Something unrelated happened"
+
+
+def _sample(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    kinds = ["tool", "request", "response", "listening", "traceback", "other"]
+    return "".join(_line(i, rng.choice(kinds)) + "\n" for i in range(n))
+
+
+def _watcher(log_file, mmap_threshold: int) -> LogWatcher:
+    watcher = LogWatcher(log_file.parent)
+    watcher.MMAP_THRESHOLD = mmap_threshold
+    watcher._get_log_file = lambda date=None: log_file
+    return watcher
+
+
+async def test_mmap_and_readlines_paths_agree(tmp_path) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    log_file.write_text(_sample(3500), encoding="utf-8")
+    assert log_file.stat().st_size > LogWatcher.MMAP_THRESHOLD
+
+    mapped = _watcher(log_file, 0)
+    buffered = _watcher(log_file, 1 << 40)
+    try:
+        mapped_entries = await mapped._read_new_entries()
+        buffered_entries = await buffered._read_new_entries()
+    finally:
+        mapped._close_file()
+        buffered._close_file()
+
+    assert mapped_entries == buffered_entries
+    assert {e.type for e in mapped_entries} == {"tool", "llm_request", "llm_response", "listening"}
+    assert mapped._file_pos == buffered._file_pos == log_file.stat().st_size
+
+
+async def test_non_ascii_sender_is_decoded_on_both_paths(tmp_path) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    log_file.write_text(_line(7, "listening") + "\n", encoding="utf-8")
+
+    for threshold in (0, 1 << 40):
+        watcher = _watcher(log_file, threshold)
+        try:
+            [entry] = await watcher._read_new_entries()
+        finally:
+            watcher._close_file()
+        assert entry.type == "listening"
+        assert entry.preview == "telegram:用户7"
+
+
+async def test_partial_trailing_line_is_read_once_complete(tmp_path) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    complete = _line(1, "tool") + "\n"
+    partial = _line(2, "listening")
+    cut = partial.index("用") + 1  # Split inside a multi-byte character
+    data = (complete + partial).encode()
+    split_at = len(complete.encode()) + len(partial[:cut].encode()) - 1
+
+    for threshold in (0, 1 << 40):
+        log_file.write_bytes(data[:split_at])
+        watcher = _watcher(log_file, threshold)
+        try:
+            first = await watcher._read_new_entries()
+            assert [e.type for e in first] == ["tool"]
+            assert watcher._file_pos == len(complete.encode())
+
+            with open(log_file, "ab") as f:
+                f.write(data[split_at:] + b"\n")
+            second = await watcher._read_new_entries()
+        finally:
+            watcher._close_file()
+        assert [(e.type, e.preview) for e in second] == [("listening", "telegram:用户2")]
+
+
+async def test_get_status_returns_logs_after_cursor(tmp_path) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    log_file.write_text("".join(_line(i, "tool") + "\n" for i in range(5)), encoding="utf-8")
+    watcher = _watcher(log_file, 1 << 40)
+    try:
+        watcher._record_entries(await watcher._read_new_entries())
+        all_ts = [log["ts"] for log in watcher.get_status()["logs"]]
+        assert len(all_ts) == 5
+
+        status = watcher.get_status(all_ts[2])
+        assert [log["ts"] for log in status["logs"]] == all_ts[3:]
+        assert status["cursor"] == all_ts[-1]
+        assert status["status"] == "tool_call"
+        assert watcher.get_status(all_ts[-1])["logs"] == []
+    finally:
+        await watcher.stop()
+
+
+async def test_day_rollover_switches_to_new_file(tmp_path) -> None:
+    day1 = tmp_path / "nanobot_2026-02-18.log"
+    day2 = tmp_path / "nanobot_2026-02-19.log"
+    day1.write_text(_line(1, "tool") + "\n", encoding="utf-8")
+    watcher = _watcher(day1, 1 << 40)
+    try:
+        assert len(await watcher._read_new_entries()) == 1
+
+        day2.write_text(_line(2, "request") + "\n", encoding="utf-8")
+        watcher._get_log_file = lambda date=None: day2
+        assert [e.type for e in await watcher._read_new_entries()] == ["llm_request"]
+        assert watcher._current_file == day2
+        assert watcher._file_pos == day2.stat().st_size
+    finally:
+        watcher._close_file()
+
+
+async def test_watch_loop_reads_on_each_notification(tmp_path, monkeypatch) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    log_file.write_text("", encoding="utf-8")
+    watcher = _watcher(log_file, 1 << 40)
+    calls = []
+
+    async def fake_awatch(path, **kwargs):
+        calls.append((path, kwargs))
+        for i, kind in enumerate(["tool", "request"]):
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(_line(i, kind) + "\n")
+            yield {("modified", str(log_file))}
+
+    monkeypatch.setattr(log_watcher_module, "WATCHFILES_AVAILABLE", True)
+    monkeypatch.setattr(log_watcher_module, "awatch", fake_awatch)
+    try:
+        await watcher._watch_loop()
+        assert [log["type"] for log in watcher.get_status()["logs"]] == ["tool", "llm_request"]
+        assert watcher.state.status == "thinking"
+        [(path, kwargs)] = calls
+        assert path == tmp_path
+        assert kwargs["debounce"] == LogWatcher.WATCH_DEBOUNCE_MS < 500
+        assert kwargs["watch_filter"] is watcher._is_log_change
+    finally:
+        await watcher.stop()
+
+
+async def test_watch_loop_falls_back_to_polling_when_watching_fails(tmp_path, monkeypatch) -> None:
+    log_file = tmp_path / "nanobot_2026-02-18.log"
+    log_file.write_text(_line(1, "tool") + "\n", encoding="utf-8")
+    watcher = _watcher(log_file, 1 << 40)
+
+    async def broken_awatch(path, **kwargs):
+        raise OSError("inotify watch limit reached")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(log_watcher_module, "WATCHFILES_AVAILABLE", True)
+    monkeypatch.setattr(log_watcher_module, "awatch", broken_awatch)
+    watcher._running = True
+    task = asyncio.create_task(watcher._watch_loop())
+    try:
+        for _ in range(100):
+            if watcher.state.logs:
+                break
+            await asyncio.sleep(0.01)
+        assert [log["type"] for log in watcher.get_status()["logs"]] == ["tool"]
+    finally:
+        watcher._watch_task = task
+        await watcher.stop()
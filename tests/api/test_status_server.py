@@ -0,0 +1,49 @@
+"""Tests for the status API's ETag handling."""
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from nanobot.api.log_watcher import LogEntry, LogWatcher
+from nanobot.api.server import StatusServer
+
+
+def _tool_entry(ts: str = "2026-02-18 23:50:00.123") -> LogEntry:
+    return LogEntry(ts=ts, type="tool", name="exec", preview="ls")
+
+
+async def test_etag_changes_after_new_entries_and_idle(tmp_path) -> None:
+    watcher = LogWatcher(tmp_path)
+    before = watcher.get_etag()
+
+    watcher._record_entries([_tool_entry()])
+    active = watcher.get_etag()
+    assert active != before
+
+    watcher._set_idle()
+    assert watcher.state.status == "idle"
+    assert watcher.get_etag() != active
+    await watcher.stop()
+
+
+async def test_etag_differs_per_cursor_and_per_watcher(tmp_path) -> None:
+    first, second = LogWatcher(tmp_path), LogWatcher(tmp_path)
+    assert first.state.version == second.state.version
+    assert first.get_etag() != second.get_etag()
+    assert first.get_etag("2026-02-18 23:50:00.123") != first.get_etag()
+
+
+async def test_status_returns_304_until_state_changes(tmp_path) -> None:
+    server = StatusServer(log_dir=tmp_path)
+    async with TestClient(TestServer(server.app)) as client:
+        resp = await client.get("/api/status")
+        assert resp.status == 200
+        etag = resp.headers["ETag"]
+
+        resp = await client.get("/api/status", headers={"If-None-Match": etag})
+        assert resp.status == 304
+
+        server.watcher._record_entries([_tool_entry()])
+        resp = await client.get("/api/status", headers={"If-None-Match": etag})
+        assert resp.status == 200
+        assert resp.headers["ETag"] != etag
+        assert (await resp.json())["status"] == "tool_call"
+    await server.watcher.stop()
@@ -0,0 +1,102 @@
+"""Tests for MessageBus inbound grouping and buffering."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import FastAsyncQueue, MessageBus
+
+
+def _msg(chat_id: str, content: str, sender_id: str = "u1") -> InboundMessage:
+    return InboundMessage(channel="test", sender_id=sender_id, chat_id=chat_id, content=content)
+
+
+async def test_consume_merges_queued_messages_per_session_in_arrival_order() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a", "one"))
+    await bus.publish_inbound(_msg("b", "two"))
+    await bus.publish_inbound(_msg("a", "three"))
+    assert bus.inbound_size == 3
+
+    first = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert first.chat_id == "a"
+    assert first.content == "[u1] one\n\n[u1] three"
+    assert len(first.metadata["collected_messages"]) == 2
+    await bus.complete_inbound_turn(first)
+
+    second = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert second.chat_id == "b"
+    assert second.content == "two"
+    assert bus.inbound_size == 0
+
+
+async def test_messages_for_active_session_are_buffered_until_turn_completes() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a", "first"))
+    active = await bus.consume_inbound()
+
+    await bus.publish_inbound(_msg("a", "follow-up"))
+    await bus.publish_inbound(_msg("b", "other"))
+    assert bus.inbound_size == 1
+
+    other = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert other.chat_id == "b"
+
+    await bus.complete_inbound_turn(active)
+    flushed = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert flushed.chat_id == "a"
+    assert flushed.content == "follow-up"
+
+
+async def test_each_active_session_buffers_independently() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a", "a1"))
+    await bus.publish_inbound(_msg("b", "b1"))
+    turn_a = await bus.consume_inbound()
+    turn_b = await bus.consume_inbound()
+
+    await bus.publish_inbound(_msg("a", "a2"))
+    await bus.publish_inbound(_msg("b", "b2"))
+    assert bus.inbound_size == 0
+
+    await bus.complete_inbound_turn(turn_b)
+    flushed = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert (flushed.chat_id, flushed.content) == ("b", "b2")
+
+    await bus.complete_inbound_turn(turn_a)
+    flushed = await asyncio.wait_for(bus.consume_inbound(), timeout=1.0)
+    assert (flushed.chat_id, flushed.content) == ("a", "a2")
+
+
+async def test_consume_inbound_batch_returns_one_merged_message_per_ready_session() -> None:
+    bus = MessageBus()
+    await bus.publish_inbound(_msg("a", "a1"))
+    await bus.publish_inbound(_msg("b", "b1"))
+    await bus.publish_inbound(_msg("a", "a2"))
+    await bus.publish_inbound(_msg("c", "c1"))
+
+    batch = await asyncio.wait_for(bus.consume_inbound_batch(max_batch=2), timeout=1.0)
+    assert [(m.chat_id, m.content) for m in batch] == [("a", "[u1] a1\n\n[u1] a2"), ("b", "b1")]
+
+    rest = await asyncio.wait_for(bus.consume_inbound_batch(), timeout=1.0)
+    assert [m.chat_id for m in rest] == ["c"]
+
+
+async def test_fast_async_queue_blocks_until_put_and_keeps_fifo_order() -> None:
+    q: FastAsyncQueue[int] = FastAsyncQueue()
+    with pytest.raises(asyncio.QueueEmpty):
+        q.get_nowait()
+
+    getter = asyncio.create_task(q.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    q.put_nowait(1)
+    await q.put(2)
+    assert await asyncio.wait_for(getter, timeout=1.0) == 1
+    assert q.qsize() == 1
+    assert q.get_nowait() == 2
+    assert q.empty()
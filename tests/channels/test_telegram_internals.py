@@ -0,0 +1,136 @@
+"""Tests for TelegramChannel helpers that don't need a live bot."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Check optional Telegram dependencies before running tests
+try:
+    import telegram  # noqa: F401
+except ImportError:
+    pytest.skip("Telegram dependencies not installed (python-telegram-bot)", allow_module_level=True)
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.telegram import TelegramChannel, _markdown_to_telegram_html
+
+
+class _TypingBot:
+    def __init__(self, failing: set[int] | None = None, slow: set[int] | None = None) -> None:
+        self.actions: list[int] = []
+        self.failing = failing or set()
+        self.slow = slow or set()
+
+    async def send_chat_action(self, chat_id: int, action: str) -> None:
+        if chat_id in self.slow:
+            await asyncio.sleep(60)
+        if chat_id in self.failing:
+            raise RuntimeError("chat not found")
+        self.actions.append(chat_id)
+
+
+def _make_channel(bot=None) -> TelegramChannel:
+    channel = TelegramChannel(SimpleNamespace(), MessageBus())
+    channel._app = SimpleNamespace(
+        bot=bot or _TypingBot(),
+        updater=SimpleNamespace(stop=AsyncMock()),
+        stop=AsyncMock(),
+        shutdown=AsyncMock(),
+    )
+    return channel
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_start_typing_sends_only_to_the_new_chat() -> None:
+    bot = _TypingBot()
+    channel = _make_channel(bot)
+    try:
+        channel._start_typing("1")
+        await _settle()
+        assert bot.actions == [1]
+
+        channel._start_typing("2")
+        await _settle()
+        assert bot.actions == [1, 2]
+        assert channel._typing_chats == {"1", "2"}
+    finally:
+        await channel.stop()
+
+
+async def test_stop_typing_removes_chat_from_refresh() -> None:
+    channel = _make_channel()
+    try:
+        channel._start_typing("1")
+        channel._start_typing("2")
+        await _settle()
+        channel._stop_typing("1")
+        assert channel._typing_chats == {"2"}
+    finally:
+        await channel.stop()
+    assert channel._typing_task is None
+    assert not channel._typing_chats
+
+
+async def test_failed_typing_send_drops_only_that_chat() -> None:
+    bot = _TypingBot(failing={3})
+    channel = _make_channel(bot)
+    try:
+        channel._start_typing("1")
+        channel._start_typing("3")
+        await _settle()
+        assert channel._typing_chats == {"1"}
+        assert bot.actions == [1]
+    finally:
+        await channel.stop()
+
+
+async def test_slow_typing_send_does_not_block_other_chats() -> None:
+    bot = _TypingBot(slow={1})
+    channel = _make_channel(bot)
+    try:
+        channel._start_typing("1")
+        await _settle()
+        channel._start_typing("2")
+        await _settle()
+        assert bot.actions == [2]
+    finally:
+        await channel.stop()
+
+
+def test_markdown_leaves_literal_placeholders_next_to_real_code() -> None:
+    text = "`x` \x00IC1\x00 \x00CB5\x00\n```\nblock\n```"
+    assert _markdown_to_telegram_html(text) == (
+        "<code>x</code> \x00IC1\x00 \x00CB5\x00\n<pre><code>block\n</code></pre>"
+    )
+
+
+def test_markdown_restores_code_block_inside_inline_code() -> None:
+    assert _markdown_to_telegram_html("`a ```<b>``` c`") == "<code>a <pre><code>&lt;b&gt;</code></pre> c</code>"
+
+
+def test_markdown_restores_deep_placeholder_chain_without_recursion() -> None:
+    # Each inline code span holds a literal placeholder pointing at the next span
+    n = 400
+    text = "".join(f"`\x00IC{i + 1}\x00`" for i in range(n))
+    html = _markdown_to_telegram_html(text)
+    assert html.count("<code>") == n * (n + 1) // 2
+    assert html.startswith("<code>" * n + f"\x00IC{n}\x00")
+
+
+def test_sender_context_follows_renamed_user() -> None:
+    chat = SimpleNamespace(type="group", title="Team")
+    user = SimpleNamespace(id=1, username="alice")
+    message = SimpleNamespace(chat=chat, chat_id=5, message_id=7)
+    assert TelegramChannel._build_sender_context(message, user) == "[from: @alice, group: Team, msg_id: 7]"
+
+    user.username = "alice2"
+    message.message_id = 8
+    assert TelegramChannel._build_sender_context(message, user) == "[from: @alice2, group: Team, msg_id: 8]"
+
+    chat.type = "private"
+    assert TelegramChannel._build_sender_context(message, user) == ""